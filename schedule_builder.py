@@ -9,6 +9,7 @@ Usage:
     python schedule_builder.py              # full run: prompt -> claude -> validate -> csv
     python schedule_builder.py --prompt     # just print the prompt (no CLI call)
     python schedule_builder.py --from-json output/schedule.json   # skip CLI, use saved JSON
+    python schedule_builder.py --solve      # skip CLI, solve locally (CP-SAT or backtracking)
 """
 
 import argparse
@@ -16,25 +17,40 @@ import csv
 import io
 import json
 import os
+import pickle
 import re
 import subprocess
 import sys
 import threading
 import time
 from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
-# Force UTF-8 on Windows so emoji/special chars in session data don't crash
-if sys.stdout.encoding != "utf-8":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-if sys.stderr.encoding != "utf-8":
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+# Force UTF-8 on Windows so emoji/special chars in session data don't crash;
+# reconfigure() keeps the existing streams and their buffering
+for stream in (sys.stdout, sys.stderr):
+    if stream.encoding != "utf-8":
+        stream.reconfigure(encoding="utf-8", errors="replace")
 
+# Optional: Rust-backed xlsx reader, several times faster than openpyxl
 try:
-    from openpyxl import load_workbook
+    from python_calamine import CalamineWorkbook
 except ImportError:
-    print("Missing dependency. Run: pip install -r requirements.txt")
-    sys.exit(1)
+    CalamineWorkbook = None
+
+# Optional: OR-Tools CP-SAT for --solve (local scheduling without Claude)
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+# Optional: orjson, a much faster JSON encoder/decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE_DIR = Path(__file__).parent
 EXCEL_PATH = BASE_DIR / "data" / "stir-trek-2026-accepted.xlsx"
@@ -43,8 +59,11 @@ CSV_PATH = OUTPUT_DIR / "schedule.csv"
 JSON_PATH = OUTPUT_DIR / "schedule.json"
 VERSIONS_PATH = OUTPUT_DIR / "versions.json"
 HTML_PATH = OUTPUT_DIR / "schedule.html"
+SESSIONS_CACHE_PATH = OUTPUT_DIR / ".sessions.pkl"
+SESSIONS_CACHE_VERSION = 1  # bump whenever read_sessions() output changes
 TEMPLATE_PATH = BASE_DIR / "templates" / "schedule_template.html"
 PREFERENCES_PATH = BASE_DIR / "data" / "speaker_preferences.md"
+SHEET_NAME = "Accepted sessions and speakers"
 SLOT_TIMES = [
     "08:30am - 09:15am",
     "09:30am - 10:15am",
@@ -54,6 +73,8 @@ SLOT_TIMES = [
     "03:00pm - 03:45pm",
     "04:00pm - 04:45pm",
 ]
+# Fixed slot order; sorting the keys would put slot_10 before slot_2
+SLOT_KEYS = tuple(f"slot_{i}" for i in range(1, len(SLOT_TIMES) + 1))
 
 ROOMS = [
     {"num": 1, "alias": "Room 1",  "capacity": 388, "live": "Theater 14", "live_capacity": 274, "simulcast": "Theaters 12, 13"},
@@ -67,6 +88,15 @@ ROOMS = [
 ]
 
 ROOM_NAMES = [f"{r['alias']} ({r['capacity']})" for r in ROOMS]
+# Room positions from largest to smallest capacity
+ROOMS_BY_SIZE = sorted(range(len(ROOMS)), key=lambda i: -ROOMS[i]["capacity"])
+# Room data as the HTML page shows it, with "Theater(s) " dropped from simulcast
+ROOMS_FOR_HTML = [
+    {"num": r["num"], "alias": r["alias"], "capacity": r["capacity"],
+     "live": r["live"], "live_capacity": r["live_capacity"],
+     "simulcast": r["simulcast"].replace("Theaters ", "").replace("Theater ", "")}
+    for r in ROOMS
+]
 
 # 2025 attendance data: speaker name -> peak attendance from last year
 # Used to inform room sizing for returning speakers
@@ -89,46 +119,152 @@ ATTENDANCE_2025 = {
     "Brian McKeiver": 48,
 }
 
+# Local solver (--solve): speakers at or above this 2025 draw must get one of
+# the two largest rooms, so at most two of them can share a slot
+HIGH_DRAW = 150
+SOLVER_TIME_LIMIT = 10  # seconds
+# Node budget for the backtracking search that seeds CP-SAT (well under a second)
+HINT_MAX_NODES = 20_000
+
+
+# ---------------------------------------------------------------------------
+# JSON helpers
+# ---------------------------------------------------------------------------
+
+def json_loads(data):
+    """Parse JSON from str or bytes, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent=False):
+    """Serialize obj to a str: compact, or indented by 2 spaces.
+
+    Non-ASCII characters are written as-is on both paths.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_json(path, obj):
+    """Write obj to path as indented UTF-8 JSON with a single write_bytes."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_bytes(json_dumps(obj, indent=True).encode("utf-8"))
+
 
 # ---------------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------------
 
-def load_sessions():
-    wb = load_workbook(EXCEL_PATH, read_only=True)
-    ws = wb["Accepted sessions and speakers"]
+def read_sheet():
+    """Return (headers, data rows) from the accepted-sessions sheet.
 
-    headers = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
-    col = {name: i for i, name in enumerate(headers)}
+    Uses python-calamine when it is installed and falls back to openpyxl.
+    """
+    if CalamineWorkbook is not None:
+        rows = CalamineWorkbook.from_path(str(EXCEL_PATH)).get_sheet_by_name(SHEET_NAME).to_python()
+        return rows[0], rows[1:]
 
-    sessions = []
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        session_id = row[col["Session Id"]]
-        if session_id is None:
-            continue
-        desc = row[col["Description"]] or ""
-        if len(desc) > 200:
-            desc = desc[:200] + "..."
-        first = row[col["FirstName"]] or ""
-        last = row[col["LastName"]] or ""
-        speaker = f"{first} {last}".strip()
-        sessions.append({
-            "id": str(session_id),
-            "title": row[col["Title"]],
-            "description": desc,
-            "speakers": speaker,
-            "track": row[col["Track"]],
-        })
+    # openpyxl is only needed on this path, so it is imported here rather than
+    # at module load
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        print("Missing dependency. Run: pip install -r requirements.txt")
+        sys.exit(1)
 
+    wb = load_workbook(EXCEL_PATH, read_only=True, data_only=True, keep_links=False)
+    rows = list(wb[SHEET_NAME].iter_rows(values_only=True))
     wb.close()
+    return rows[0], rows[1:]
+
+
+def normalize_id(value):
+    """Return a Session Id cell as a string, or None for blank rows."""
+    # calamine reports blank cells as "" and numeric cells as floats
+    if value is None or value == "":
+        return None
+    if isinstance(value, float):
+        value = int(value)
+    return str(value)
+
+
+def truncate(text, limit=200):
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+# OOXML escapes for control characters, e.g. _x000D_ for a carriage return
+OOXML_ESCAPE_RE = re.compile(r"_x([0-9A-Fa-f]{4})_")
+
+
+def unescape(text):
+    """Decode OOXML _xHHHH_ escapes, like openpyxl.utils.escape.unescape."""
+    if "_x" not in text:
+        return text
+    return OOXML_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), text)
+
+
+def read_sessions():
+    headers, rows = read_sheet()
+    col = {name: i for i, name in enumerate(headers)}
+    id_i, title_i, desc_i = col["Session Id"], col["Title"], col["Description"]
+    first_i, last_i, track_i = col["FirstName"], col["LastName"], col["Track"]
+
+    # openpyxl's read-only mode leaves OOXML escapes such as _x000D_ in place
+    return [
+        {
+            "id": session_id,
+            "title": row[title_i],
+            "description": truncate(unescape(row[desc_i] or "")),
+            "speakers": f"{row[first_i] or ''} {row[last_i] or ''}".strip(),
+            "track": row[track_i],
+        }
+        for row in rows
+        if (session_id := normalize_id(row[id_i])) is not None
+    ]
+
+
+def load_sessions():
+    """Return the accepted sessions, reusing the pickle cache while the workbook is unchanged."""
+    stat = EXCEL_PATH.stat()
+    key = (SESSIONS_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    try:
+        with open(SESSIONS_CACHE_PATH, "rb") as f:
+            cached = pickle.load(f)
+        if cached["key"] == key:
+            return cached["sessions"]
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError,
+            ImportError, IndexError):
+        pass  # missing, stale-format or corrupt cache: rebuild it below
+
+    sessions = read_sessions()
+    try:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(SESSIONS_CACHE_PATH, "wb") as f:
+            pickle.dump({"key": key, "sessions": sessions}, f, pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # the cache is only an optimization
     return sessions
 
 
 def find_multi_session_speakers(sessions):
-    speaker_sessions = defaultdict(list)
+    first_seen = {}
+    multi = {}
     for s in sessions:
-        speaker_sessions[s["speakers"]].append(s["id"])
-    return {k: v for k, v in speaker_sessions.items() if len(v) > 1}
+        speaker = s["speakers"]
+        if speaker in multi:
+            multi[speaker].append(s["id"])
+        elif speaker in first_seen:
+            multi[speaker] = [first_seen[speaker], s["id"]]
+        else:
+            first_seen[speaker] = s["id"]
+    return multi
 
 
 def load_preferences():
@@ -142,62 +278,54 @@ def load_preferences():
 # Prompt generation
 # ---------------------------------------------------------------------------
 
-def build_prompt(sessions, multi_speakers, preferences=""):
-    session_block = "\n".join(
-        f"- ID: {s['id']} | Title: {s['title']} | Speaker: {s['speakers']} "
-        f"| Track: {s['track']} | Desc: {s['description']}"
-        for s in sessions
-    )
-
-    speaker_constraint = "\n".join(
-        f"  - {speaker}: sessions {', '.join(ids)}"
-        for speaker, ids in multi_speakers.items()
-    )
-
+def build_prompt(sessions, multi_speakers, preferences="", candidates=1):
+    fields = itemgetter("id", "title", "speakers", "track", "description")
     track_counts = Counter(s["track"] for s in sessions)
-    track_summary = "\n".join(
-        f"  - {t}: {track_counts[t]} sessions"
-        for t in sorted(track_counts)
-    )
-
-    room_block = "\n".join(
-        f"  Position {i} = Room {r['num']}: {r['capacity']} seats "
-        f"(live in {r['live']}, simulcast to {r['simulcast']})"
-        for i, r in enumerate(ROOMS)
-    )
 
     # Build 2025 attendance info for returning speakers
-    attendance_lines = []
-    for s in sessions:
-        peak = ATTENDANCE_2025.get(s["speakers"])
-        if peak:
-            attendance_lines.append(
-                f"  - {s['speakers']} (session {s['id']}): "
-                f"2025 peak attendance = {peak}"
-            )
-    attendance_block = "\n".join(attendance_lines) if attendance_lines else "  (no data)"
+    attendance_lines = [
+        f"  - {s['speakers']} (session {s['id']}): 2025 peak attendance = {peak}\n"
+        for s in sessions
+        if (peak := ATTENDANCE_2025.get(s["speakers"]))
+    ]
 
-    return f"""You are a conference schedule optimizer for Stir Trek 2026.
+    # Collect every piece of the prompt in one list and join once at the end
+    parts = ["""You are a conference schedule optimizer for Stir Trek 2026.
 
 TASK: Assign all 56 sessions to 7 time slots with 8 rooms each.
 Each slot is an array of 8 session IDs where POSITION MATTERS — position maps to a specific room.
 
 ROOM ASSIGNMENTS (array index -> room):
-{room_block}
+"""]
+    parts.extend(
+        f"  Position {i} = Room {r['num']}: {r['capacity']} seats "
+        f"(live in {r['live']}, simulcast to {r['simulcast']})\n"
+        for i, r in enumerate(ROOMS)
+    )
 
-SESSIONS:
-{session_block}
+    parts.append("\nSESSIONS:\n")
+    parts.extend(
+        f"- ID: {sid} | Title: {title} | Speaker: {speaker} "
+        f"| Track: {track} | Desc: {desc}\n"
+        for sid, title, speaker, track, desc in map(fields, sessions)
+    )
 
-TRACK SUMMARY:
-{track_summary}
+    parts.append("\nTRACK SUMMARY:\n")
+    parts.extend(f"  - {t}: {track_counts[t]} sessions\n" for t in sorted(track_counts))
 
+    parts.append("""
 HARD CONSTRAINTS (must all be satisfied):
 1. Exactly 7 time slots (slot_1 through slot_7), each with exactly 8 sessions.
 2. Every session ID must appear exactly once across all slots.
 3. No speaker may appear in two sessions in the same time slot.
    Multi-session speakers who MUST be in different slots:
-{speaker_constraint}
+""")
+    parts.extend(
+        f"  - {speaker}: sessions {', '.join(ids)}\n"
+        for speaker, ids in multi_speakers.items()
+    )
 
+    parts.append("""
 SOFT CONSTRAINTS (optimize for these):
 1. Minimize same-track sessions in the same time slot. Spread tracks across slots.
 2. Spread popular/large tracks (Application Development, Architecture, AI/ML) across many slots.
@@ -206,8 +334,10 @@ SOFT CONSTRAINTS (optimize for these):
    Room sizes: Room 1 (388) > Room 5 (340) > Room 2 (314) > Room 6 (293) > Room 4 (234) > Room 3 (228) > Room 7 (224) > Room 8 (173)
 
    RETURNING SPEAKER ATTENDANCE FROM 2025 (use this to prioritize room assignments):
-{attendance_block}
+""")
+    parts.extend(attendance_lines or ["  (no data)\n"])
 
+    parts.append("""
    Room assignment guidelines based on 2025 data:
    - 150+ attendance -> MUST be in Rooms 1 (388) or 5 (340): Cory House, Kathryn Grayson Nanz, Guy Royse, Matt Eland, Jeff McWherter
    - 100-149 attendance -> Prefer Rooms 2 (314) or 6 (293): Tristan Chiappisi, Barret Blake
@@ -215,24 +345,36 @@ SOFT CONSTRAINTS (optimize for these):
    - Architecture sessions -> Rooms 2-6
    - Niche/specialized sessions -> Rooms 7 (224) or 8 (173)
    - New speakers with unknown draw -> middle rooms (3, 4, 6, 7)
-{f"""
-SPEAKER PREFERENCES (additional constraints from organizers):
-{preferences}
-""" if preferences else ""}
-OUTPUT FORMAT:
-Return ONLY valid JSON, no other text. Use this exact structure:
-{{
-  "slot_1": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_2": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_3": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_4": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_5": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_6": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"],
-  "slot_7": ["room1_id", "room2_id", "room3_id", "room4_id", "room5_id", "room6_id", "room7_id", "room8_id"]
-}}
+""")
 
+    if preferences:
+        parts.append(
+            "\nSPEAKER PREFERENCES (additional constraints from organizers):\n"
+            f"{preferences}\n"
+        )
+
+    room_ids = ", ".join(f'"room{n}_id"' for n in range(1, len(ROOMS) + 1))
+    parts.append("\nOUTPUT FORMAT:\n")
+    if candidates > 1:
+        # One round trip returns several alternatives; main() picks the best
+        parts.append(
+            f"Return ONLY valid JSON, no other text. Return {candidates} different "
+            "candidate schedules, each satisfying every hard constraint. "
+            "Use this exact structure:\n"
+            '{\n  "candidates": [\n    {\n'
+        )
+        parts.append(",\n".join(f'      "{k}": [{room_ids}]' for k in SLOT_KEYS))
+        parts.append(f"\n    }},\n    ... {candidates} schedule objects in total\n  ]\n}}\n")
+    else:
+        parts.append("Return ONLY valid JSON, no other text. Use this exact structure:\n{\n")
+        parts.append(",\n".join(f'  "{k}": [{room_ids}]' for k in SLOT_KEYS))
+        parts.append("\n}\n")
+
+    parts.append("""
 Each array must contain exactly 8 session IDs as strings. Position 0 = Room 1 (388 seats), Position 7 = Room 8 (173 seats).
-Use the exact Session Id values provided above."""
+Use the exact Session Id values provided above.""")
+
+    return "".join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -240,7 +382,7 @@ Use the exact Session Id values provided above."""
 # ---------------------------------------------------------------------------
 
 def call_claude(prompt):
-    """Call Claude CLI in headless mode. Returns parsed schedule dict."""
+    """Call Claude CLI in headless mode. Returns a list of candidate schedule dicts."""
     print("Calling Claude CLI to generate schedule...")
     print(f"  Prompt size: {len(prompt):,} characters")
 
@@ -274,6 +416,14 @@ def call_claude(prompt):
     stderr_thread = threading.Thread(target=stream_stderr, daemon=True)
     stderr_thread.start()
 
+    # Drain stdout concurrently too: if nobody reads it, a response larger than
+    # the pipe buffer blocks the CLI and we sit here until the timeout
+    stdout_chunks = []
+    stdout_thread = threading.Thread(
+        target=lambda: stdout_chunks.append(proc.stdout.read()), daemon=True
+    )
+    stdout_thread.start()
+
     # Send prompt and close stdin
     proc.stdin.write(prompt.encode("utf-8"))
     proc.stdin.close()
@@ -301,7 +451,8 @@ def call_claude(prompt):
     print(f"\r  Claude responded in {mins}:{secs:02d}    ")
 
     stderr_thread.join(timeout=2)
-    stdout = proc.stdout.read().decode("utf-8", errors="replace")
+    stdout_thread.join()
+    stdout = b"".join(stdout_chunks).decode("utf-8", errors="replace")
 
     if proc.returncode != 0:
         print(f"Claude CLI error (exit {proc.returncode}):")
@@ -318,11 +469,38 @@ def call_claude(prompt):
     return parse_claude_response(raw)
 
 
+# Fallback patterns for pulling the schedule out of free-form response text
+FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+SLOT1_RE = re.compile(r'(\{\s*"(?:slot_1|candidates)".*\})', re.DOTALL)
+
+
+def as_candidates(parsed):
+    """Return the schedules in a parsed response as a list.
+
+    Accepts either a single schedule or a {"candidates": [...]} object.
+    """
+    if isinstance(parsed, dict) and "candidates" in parsed:
+        schedules = parsed["candidates"]
+        if not isinstance(schedules, list) or not schedules:
+            print("Response has no candidate schedules.")
+            sys.exit(1)
+    else:
+        schedules = [parsed]
+
+    # Model output is untrusted: every schedule must map slot keys to ID lists
+    for i, schedule in enumerate(schedules, 1):
+        if not isinstance(schedule, dict) or not all(isinstance(v, list) for v in schedule.values()):
+            print(f"Candidate {i} is not a schedule object of slot -> session ID lists.")
+            print("Got (first 300 chars):", str(schedule)[:300])
+            sys.exit(1)
+    return schedules
+
+
 def parse_claude_response(raw):
-    """Extract schedule JSON from Claude CLI's JSON-envelope output."""
+    """Extract the list of candidate schedules from Claude CLI's JSON-envelope output."""
     # Parse the outer envelope
     try:
-        envelope = json.loads(raw)
+        envelope = json_loads(raw)
     except json.JSONDecodeError:
         print("Failed to parse Claude CLI output as JSON.")
         print("Raw output (first 500 chars):", raw[:500])
@@ -342,25 +520,28 @@ def parse_claude_response(raw):
     else:
         text = str(envelope)
 
-    # Try direct parse
-    try:
-        return json.loads(text)
-    except (json.JSONDecodeError, TypeError):
-        pass
+    # Try direct parse, but only when the text starts like a JSON object;
+    # fenced or chatty responses go straight to the regex fallbacks
+    stripped = text.lstrip()
+    if stripped.startswith("{"):
+        try:
+            return as_candidates(json_loads(stripped))
+        except json.JSONDecodeError:
+            pass
 
     # Try extracting from markdown code fences
-    m = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+    m = FENCE_RE.search(text)
     if m:
         try:
-            return json.loads(m.group(1))
+            return as_candidates(json_loads(m.group(1)))
         except json.JSONDecodeError:
             pass
 
     # Try finding raw JSON with slot_1 key
-    m = re.search(r'(\{\s*"slot_1".*\})', text, re.DOTALL)
+    m = SLOT1_RE.search(text)
     if m:
         try:
-            return json.loads(m.group(1))
+            return as_candidates(json_loads(m.group(1)))
         except json.JSONDecodeError:
             pass
 
@@ -369,120 +550,328 @@ def parse_claude_response(raw):
     sys.exit(1)
 
 
+# ---------------------------------------------------------------------------
+# Local solver
+# ---------------------------------------------------------------------------
+
+def assign_rooms(slot_ids, session_map):
+    """Place one slot's sessions into room positions, biggest 2025 draw in the biggest room."""
+    ranked = sorted(
+        slot_ids,
+        key=lambda sid: -ATTENDANCE_2025.get(session_map[sid]["speakers"], 0),
+    )
+    row = [None] * len(ROOMS)
+    for pos, sid in zip(ROOMS_BY_SIZE, ranked):
+        row[pos] = sid
+    return row
+
+
+def solve_backtracking(sessions, multi_speakers, max_nodes=None):
+    """Assign sessions to slots by backtracking search with forward checking.
+
+    Pure Python: --solve falls back to it when OR-Tools is missing, and its
+    answer seeds CP-SAT otherwise. Same hard constraints as solve_schedule();
+    the next session is always the one with the fewest slots left, and it
+    tries the slots holding the fewest of its track first, so tracks are
+    spread greedily rather than optimally. Returns None if nothing fits, or
+    if max_nodes is given and the search visits that many nodes first.
+    """
+    ids = [s["id"] for s in sessions]
+    session_map = {s["id"]: s for s in sessions}
+    n_slots, per_slot = len(SLOT_KEYS), len(ROOMS)
+
+    track_of = {s["id"]: s["track"] for s in sessions}
+    track_size = Counter(track_of.values())
+    peers = {sid: [] for sid in ids}
+    for speaker_ids in multi_speakers.values():
+        for sid in speaker_ids:
+            peers[sid] = [other for other in speaker_ids if other != sid]
+    high_draw = {
+        s["id"] for s in sessions
+        if ATTENDANCE_2025.get(s["speakers"], 0) >= HIGH_DRAW
+    }
+    # Counting bounds the search would only discover by exhausting every branch
+    if (len(ids) != n_slots * per_slot
+            or len(high_draw) > 2 * n_slots
+            or any(len(sids) > n_slots for sids in multi_speakers.values())):
+        return None
+
+    # Tie-break for equally constrained sessions: shared speakers, big draws,
+    # then big tracks go first
+    rank = {
+        sid: (-len(peers[sid]), sid not in high_draw, -track_size[track_of[sid]], i)
+        for i, sid in enumerate(ids)
+    }
+
+    domains = {sid: set(range(n_slots)) for sid in ids}
+    slot_of = {}
+    fill = [0] * n_slots
+    high_fill = [0] * n_slots
+    track_fill = [Counter() for _ in range(n_slots)]
+
+    def forward_check(sid, k):
+        """Drop slot k from sessions that can no longer use it; None on a wipeout."""
+        if fill[k] == per_slot:
+            affected = [o for o in ids if o not in slot_of]
+        else:
+            affected = [o for o in peers[sid] if o not in slot_of]
+            if sid in high_draw and high_fill[k] == 2:
+                affected += [o for o in high_draw if o not in slot_of]
+        pruned = []
+        for other in affected:
+            if k in domains[other]:
+                domains[other].discard(k)
+                pruned.append(other)
+                if not domains[other]:
+                    for o in pruned:
+                        domains[o].add(k)
+                    return None
+        return pruned
+
+    def place(sid, k, step):
+        if step > 0:
+            slot_of[sid] = k
+        else:
+            del slot_of[sid]
+        fill[k] += step
+        high_fill[k] += step * (sid in high_draw)
+        track_fill[k][track_of[sid]] += step
+
+    nodes = 0
+
+    def search():
+        """Return True to stop: every session placed, or the node budget spent."""
+        nonlocal nodes
+        if len(slot_of) == len(ids):
+            return True
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            return True
+        sid = min(
+            (o for o in ids if o not in slot_of),
+            key=lambda o: (len(domains[o]), rank[o]),
+        )
+        track = track_of[sid]
+        for k in sorted(domains[sid], key=lambda k: (track_fill[k][track], fill[k], k)):
+            place(sid, k, 1)
+            pruned = forward_check(sid, k)
+            if pruned is not None:
+                if search():
+                    return True
+                for other in pruned:
+                    domains[other].add(k)
+            place(sid, k, -1)
+        return False
+
+    if not search() or len(slot_of) < len(ids):
+        return None
+    return {
+        slot_key: assign_rooms([sid for sid in ids if slot_of[sid] == k], session_map)
+        for k, slot_key in enumerate(SLOT_KEYS)
+    }
+
+
+def solve_schedule(sessions, multi_speakers):
+    """Build a schedule with OR-Tools CP-SAT instead of calling Claude.
+
+    The hard constraints match the prompt's. The objective minimizes track
+    doublings, and 150+ draw speakers are capped at two per slot so each gets
+    Room 1 or 5. The search starts from solve_backtracking()'s answer.
+    Session descriptions and speaker preferences are not considered; use the
+    Claude path when those matter.
+    """
+    print("Solving schedule locally with CP-SAT...")
+    ids = [s["id"] for s in sessions]
+    session_map = {s["id"]: s for s in sessions}
+    slots = range(len(SLOT_KEYS))
+
+    by_track = {}
+    for s in sessions:
+        by_track.setdefault(s["track"], []).append(s["id"])
+    high_draw = [
+        s["id"] for s in sessions
+        if ATTENDANCE_2025.get(s["speakers"], 0) >= HIGH_DRAW
+    ]
+
+    model = cp_model.CpModel()
+    x = {(sid, k): model.NewBoolVar(f"x_{sid}_{k}") for sid in ids for k in slots}
+
+    for sid in ids:
+        model.AddExactlyOne(x[sid, k] for k in slots)
+
+    doublings = []
+    for k in slots:
+        model.Add(sum(x[sid, k] for sid in ids) == len(ROOMS))
+        for speaker_ids in multi_speakers.values():
+            model.AddAtMostOne(x[sid, k] for sid in speaker_ids)
+        model.Add(sum(x[sid, k] for sid in high_draw) <= 2)
+        # Doublings for a track in a slot = sessions of that track beyond the first
+        for track, track_ids in by_track.items():
+            if len(track_ids) < 2:
+                continue
+            extra = model.NewIntVar(0, len(track_ids) - 1, f"extra_{k}_{track}")
+            model.Add(extra >= sum(x[sid, k] for sid in track_ids) - 1)
+            doublings.append(extra)
+    model.Minimize(sum(doublings))
+
+    # Start from the backtracking answer so CP-SAT only has to improve on it;
+    # the search is capped so a hard instance can't stall before CP-SAT runs
+    hint = solve_backtracking(sessions, multi_speakers, max_nodes=HINT_MAX_NODES)
+    if hint is None:
+        print(f"  No backtracking hint within {HINT_MAX_NODES:,} nodes; CP-SAT starts cold")
+    else:
+        for k, slot_key in zip(slots, SLOT_KEYS):
+            in_slot = set(hint[slot_key])
+            for sid in ids:
+                model.AddHint(x[sid, k], sid in in_slot)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = SOLVER_TIME_LIMIT
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print(f"CP-SAT found no schedule ({solver.StatusName(status)})")
+        sys.exit(1)
+    print(f"  {solver.StatusName(status)}: {int(solver.ObjectiveValue())} track doublings "
+          f"in {solver.WallTime():.1f}s")
+
+    return {
+        slot_key: assign_rooms(
+            [sid for sid in ids if solver.BooleanValue(x[sid, k])], session_map
+        )
+        for k, slot_key in zip(slots, SLOT_KEYS)
+    }
+
+
 # ---------------------------------------------------------------------------
 # Validation
 # ---------------------------------------------------------------------------
 
-def validate_schedule(schedule, sessions):
+def speaker_bits(sessions):
+    """Map each session ID to a single-bit int, one bit per distinct speaker."""
+    index = {}
+    return {
+        s["id"]: 1 << index.setdefault(s["speakers"], len(index))
+        for s in sessions
+    }
+
+
+def validate_schedule(schedule, session_map, bits):
+    """Check the hard constraints; bits is the speaker_bits() map for the sessions."""
     errors = []
-    session_map = {s["id"]: s for s in sessions}
-    all_ids = set(session_map.keys())
+    all_ids = session_map.keys()
 
     if len(schedule) != 7:
         errors.append(f"Expected 7 slots, got {len(schedule)}")
 
-    assigned_ids = []
-    for slot_name in sorted(schedule.keys()):
+    unexpected = [k for k in schedule if k not in SLOT_KEYS]
+    if unexpected:
+        errors.append(f"Unexpected slot keys: {unexpected}")
+
+    seen = set()
+    dupes = {}  # used as an ordered set: first-repeat order for the message
+    for slot_name in (k for k in SLOT_KEYS if k in schedule):
         slot_ids = schedule[slot_name]
         if len(slot_ids) != 8:
             errors.append(f"{slot_name}: expected 8 sessions, got {len(slot_ids)}")
 
-        speakers_in_slot = []
+        # Speakers already seen in this slot, as an OR of their bits
+        slot_mask = 0
         for sid in slot_ids:
             if sid is None:
                 continue
             sid = str(sid)
-            assigned_ids.append(sid)
+            if sid not in seen:
+                seen.add(sid)
+            else:
+                dupes[sid] = None
             if sid in session_map:
-                speaker = session_map[sid]["speakers"]
-                if speaker in speakers_in_slot:
+                bit = bits[sid]
+                if slot_mask & bit:
                     errors.append(
-                        f"{slot_name}: speaker '{speaker}' appears twice"
+                        f"{slot_name}: speaker '{session_map[sid]['speakers']}' appears twice"
                     )
-                speakers_in_slot.append(speaker)
+                slot_mask |= bit
             else:
                 errors.append(f"{slot_name}: unknown session ID '{sid}'")
 
-    assigned_set = set(assigned_ids)
-    missing = all_ids - assigned_set
+    missing = all_ids - seen
     if missing:
         errors.append(f"Missing sessions: {missing}")
-    extra = assigned_set - all_ids
+    extra = seen - all_ids
     if extra:
         errors.append(f"Unknown session IDs: {extra}")
-    dupes = [sid for sid, c in Counter(assigned_ids).items() if c > 1]
     if dupes:
-        errors.append(f"Duplicate session IDs: {dupes}")
+        errors.append(f"Duplicate session IDs: {list(dupes)}")
 
     return len(errors) == 0, errors
 
 
-def compute_track_stats(schedule, sessions):
-    session_map = {s["id"]: s for s in sessions}
+def compute_track_stats(schedule, session_map):
     stats = {}
     total_doublings = 0
 
-    for slot_name in sorted(schedule.keys()):
-        tracks = [
-            session_map[str(sid)]["track"]
-            for sid in schedule[slot_name]
-            if sid is not None and str(sid) in session_map
-        ]
-        counts = Counter(tracks)
+    for slot_name in (k for k in SLOT_KEYS if k in schedule):
+        # Count tracks and doublings in the same pass over the slot
+        counts = defaultdict(int)
+        for sid in schedule[slot_name]:
+            s = session_map.get(str(sid))
+            if s is not None:
+                track = s["track"]
+                counts[track] += 1
+                if counts[track] > 1:
+                    total_doublings += 1
         stats[slot_name] = counts
-        for c in counts.values():
-            if c > 1:
-                total_doublings += c - 1
 
     return stats, total_doublings
 
 
+def room_fit(schedule, session_map):
+    """Score how well known 2025 draws line up with room sizes (higher is better).
+
+    Sums attendance x capacity over returning speakers, which is largest when
+    the biggest draws sit in the biggest rooms.
+    """
+    fit = 0
+    for slot_name in (k for k in SLOT_KEYS if k in schedule):
+        for room, sid in zip(ROOMS, schedule[slot_name]):
+            s = session_map.get(str(sid))
+            if s is not None:
+                fit += ATTENDANCE_2025.get(s["speakers"], 0) * room["capacity"]
+    return fit
+
+
 # ---------------------------------------------------------------------------
 # CSV output
 # ---------------------------------------------------------------------------
 
-def write_csv(schedule, sessions):
-    session_map = {s["id"]: s for s in sessions}
+def write_csv(schedule, session_map):
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Time"] + ROOM_NAMES)
-
-        writer.writerow(["07:30am - 08:30am | Breakfast"] + ["Breakfast"] * 8)
-
-        slot_keys = sorted(schedule.keys())
-        for i, slot_key in enumerate(slot_keys[:4]):
-            row = [SLOT_TIMES[i]]
-            for sid in schedule[slot_key]:
-                if sid is None:
-                    row.append("")
-                else:
-                    s = session_map.get(str(sid))
-                    row.append(
-                        f"{s['title']} - {s['speakers']}" if s else f"Unknown ({sid})"
-                    )
-            writer.writerow(row)
-
-        writer.writerow(["12:15pm - 01:00pm | Lunch"] + ["Lunch"] * 8)
-        writer.writerow(["01:00pm - 01:45pm | Pending"] + ["Pending"] * 8)
-
-        for i, slot_key in enumerate(slot_keys[4:]):
-            row = [SLOT_TIMES[4 + i]]
-            for sid in schedule[slot_key]:
-                if sid is None:
-                    row.append("")
-                else:
-                    s = session_map.get(str(sid))
-                    row.append(
-                        f"{s['title']} - {s['speakers']}" if s else f"Unknown ({sid})"
-                    )
-            writer.writerow(row)
+    labels = {sid: f"{s['title']} - {s['speakers']}" for sid, s in session_map.items()}
 
-        writer.writerow(
-            ["05:00pm - 06:00pm | Movie Trailers"] + ["Movie Trailers"] * 8
-        )
+    def cell(sid):
+        if sid is None:
+            return ""
+        return labels.get(str(sid)) or f"Unknown ({sid})"
 
+    slot_keys = [k for k in SLOT_KEYS if k in schedule]
+    session_rows = [
+        [SLOT_TIMES[i]] + [cell(sid) for sid in schedule[slot_key]]
+        for i, slot_key in enumerate(slot_keys)
+    ]
+    rows = [
+        ["Time"] + ROOM_NAMES,
+        ["07:30am - 08:30am | Breakfast"] + ["Breakfast"] * 8,
+        *session_rows[:4],
+        ["12:15pm - 01:00pm | Lunch"] + ["Lunch"] * 8,
+        ["01:00pm - 01:45pm | Pending"] + ["Pending"] * 8,
+        *session_rows[4:],
+        ["05:00pm - 06:00pm | Movie Trailers"] + ["Movie Trailers"] * 8,
+    ]
+
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    CSV_PATH.write_text(buf.getvalue(), encoding="utf-8", newline="")
     print(f"CSV written to {CSV_PATH}")
 
 
@@ -493,15 +882,12 @@ def write_csv(schedule, sessions):
 def load_versions():
     """Load all versions from versions.json, or return empty list."""
     if VERSIONS_PATH.exists():
-        with open(VERSIONS_PATH, encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(VERSIONS_PATH.read_bytes())
     return []
 
 
 def save_version(schedule, label="", description=""):
     """Append a new version to versions.json and return the version number."""
-    from datetime import datetime, timezone
-
     versions = load_versions()
     next_ver = max((v["version"] for v in versions), default=0) + 1
 
@@ -514,8 +900,7 @@ def save_version(schedule, label="", description=""):
     })
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    with open(VERSIONS_PATH, "w", encoding="utf-8") as f:
-        json.dump(versions, f, indent=2)
+    write_json(VERSIONS_PATH, versions)
 
     return next_ver
 
@@ -524,6 +909,10 @@ def save_version(schedule, label="", description=""):
 # HTML output
 # ---------------------------------------------------------------------------
 
+# __NAME_DATA__ tokens in the template, filled in by write_html
+PLACEHOLDER_RE = re.compile(r"__([A-Z_]+_DATA)__")
+
+
 def write_html(sessions):
     """Generate schedule.html from template with all versions and drag-and-drop support."""
     versions = load_versions()
@@ -539,22 +928,38 @@ def write_html(sessions):
         s["id"]: {"title": s["title"], "speakers": s["speakers"], "track": s["track"]}
         for s in sessions
     }
-    rooms_list = [
-        {"num": r["num"], "alias": r["alias"], "capacity": r["capacity"],
-         "live": r["live"], "live_capacity": r["live_capacity"],
-         "simulcast": r["simulcast"].replace("Theaters ", "").replace("Theater ", "")}
-        for r in ROOMS
+
+    # Each schedule rides along as its own JSON string; the page only parses
+    # the ones it actually shows
+    versions_for_html = [
+        {**{k: v for k, v in ver.items() if k != "schedule"},
+         "schedule_json": json_dumps(ver["schedule"])}
+        for ver in versions
     ]
 
     # Load speaker preferences for the preferences panel
     preferences = load_preferences()
 
-    html = template
-    html = html.replace("__ROOMS_DATA__", json.dumps(rooms_list, indent=2))
-    html = html.replace("__SESSIONS_DATA__", json.dumps(sessions_dict, indent=2))
-    html = html.replace("__VERSIONS_DATA__", json.dumps(versions, indent=2))
-    html = html.replace("__ATTENDANCE_DATA__", json.dumps(ATTENDANCE_2025, indent=2))
-    html = html.replace("__PREFERENCES_DATA__", json.dumps(preferences))
+    # Compact, unescaped JSON: the page only parses it, nobody reads it
+    to_js = json_dumps
+
+    # Data objects go in as a string for JSON.parse(), which browsers load
+    # faster than the same data written as an object literal
+    def to_js_parse(obj):
+        return json_dumps(json_dumps(obj))
+
+    data = {
+        "ROOMS_DATA": to_js_parse(ROOMS_FOR_HTML),
+        "SESSIONS_DATA": to_js_parse(sessions_dict),
+        "VERSIONS_DATA": to_js_parse(versions_for_html),
+        "ATTENDANCE_DATA": to_js_parse(ATTENDANCE_2025),
+        "SLOT_KEYS_DATA": to_js_parse(SLOT_KEYS),
+        "PREFERENCES_DATA": to_js(preferences),
+    }
+
+    # Fill every placeholder in a single pass over the template; injected data
+    # is never rescanned, so it can't be mistaken for another placeholder
+    html = PLACEHOLDER_RE.sub(lambda m: data.get(m.group(1), m.group(0)), template)
 
     with open(HTML_PATH, "w", encoding="utf-8") as f:
         f.write(html)
@@ -588,7 +993,21 @@ def main():
         "--html-only", action="store_true",
         help="Regenerate HTML from existing versions.json (no scheduling)",
     )
+    parser.add_argument(
+        "--solve", action="store_true",
+        help="Build the schedule locally instead of calling Claude CLI: OR-Tools "
+             "CP-SAT if installed, otherwise a built-in backtracking search",
+    )
+    parser.add_argument(
+        "--candidates", metavar="K", type=int, default=1,
+        help="Ask Claude for K alternative schedules in one call, keep the best "
+             "and save all K as versions (default: 1)",
+    )
     args = parser.parse_args()
+    if args.candidates < 1:
+        parser.error("--candidates must be at least 1")
+    if args.candidates > 1 and (args.solve or args.from_json):
+        parser.error("--candidates only applies to Claude CLI runs, not --solve or --from-json")
 
     # Load sessions
     print("Loading session data...", file=sys.stderr)
@@ -614,45 +1033,75 @@ def main():
               file=sys.stderr)
 
     # Build prompt (always needed for --prompt mode, useful to log otherwise)
-    prompt = build_prompt(sessions, multi_speakers, preferences)
+    prompt = build_prompt(sessions, multi_speakers, preferences, args.candidates)
 
     # --prompt mode: just dump it and exit
     if args.prompt:
         print(prompt)
         return
 
-    # Get schedule: either from file or from Claude CLI
+    # Get candidate schedules: from file, the local solver, or Claude CLI
     if args.from_json:
         print(f"Reading schedule from {args.from_json}...", file=sys.stderr)
-        with open(args.from_json) as f:
-            schedule = json.load(f)
+        candidates = as_candidates(json_loads(Path(args.from_json).read_bytes()))
+    elif args.solve:
+        if cp_model is not None:
+            schedule = solve_schedule(sessions, multi_speakers)
+        else:
+            print("OR-Tools not installed; solving with backtracking search...")
+            schedule = solve_backtracking(sessions, multi_speakers)
+            if schedule is None:
+                print("No schedule satisfies the hard constraints.")
+                sys.exit(1)
+        candidates = [schedule]
     else:
-        schedule = call_claude(prompt)
+        candidates = call_claude(prompt)
 
-    # Normalize IDs to strings
-    schedule = {
-        k: [str(sid) for sid in v] for k, v in schedule.items()
-    }
+    # Normalize IDs to strings (only rebuild slots that actually hold non-strings)
+    for schedule in candidates:
+        for k, v in schedule.items():
+            if any(not isinstance(sid, str) for sid in v):
+                schedule[k] = [str(sid) for sid in v]
+
+    # Index sessions once for validation, stats, and CSV output
+    session_map = {s["id"]: s for s in sessions}
+    bits = speaker_bits(sessions)
+
+    # Pick the best candidate: valid first, then fewest track doublings,
+    # then the best fit of known 2025 draws to room sizes
+    best = 0
+    if len(candidates) > 1:
+        print(f"\n--- Candidates ({len(candidates)}) ---", file=sys.stderr)
+        scores = []
+        for i, schedule in enumerate(candidates, 1):
+            ok, errors = validate_schedule(schedule, session_map, bits)
+            _, total_doublings = compute_track_stats(schedule, session_map)
+            fit = room_fit(schedule, session_map)
+            scores.append((not ok, len(errors), total_doublings, -fit))
+            status = "PASS" if ok else f"FAIL ({len(errors)} violations)"
+            print(f"  candidate {i}: {status}, {total_doublings} track doublings, "
+                  f"room fit {fit:,}", file=sys.stderr)
+        best = min(range(len(candidates)), key=scores.__getitem__)
+        print(f"  Selected candidate {best + 1}", file=sys.stderr)
+    schedule = candidates[best]
 
     # Save the raw schedule JSON for reuse
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    with open(JSON_PATH, "w") as f:
-        json.dump(schedule, f, indent=2)
+    write_json(JSON_PATH, schedule)
     print(f"Schedule JSON saved to {JSON_PATH}", file=sys.stderr)
 
     # Validate
     print("\n--- Validation ---", file=sys.stderr)
-    ok, errors = validate_schedule(schedule, sessions)
+    ok, errors = validate_schedule(schedule, session_map, bits)
     if ok:
         print("PASS: All hard constraints satisfied", file=sys.stderr)
     else:
         print("FAIL: Constraint violations:", file=sys.stderr)
-        for err in errors:
-            print(f"  - {err}", file=sys.stderr)
+        print("\n".join(f"  - {err}" for err in errors), file=sys.stderr)
 
     # Track stats
     print("\n--- Track Distribution ---", file=sys.stderr)
-    stats, total_doublings = compute_track_stats(schedule, sessions)
+    stats, total_doublings = compute_track_stats(schedule, session_map)
     for slot_name, track_counts in stats.items():
         doubled = {t: c for t, c in track_counts.items() if c > 1}
         suffix = f"  doubled: {dict(doubled)}" if doubled else ""
@@ -660,16 +1109,25 @@ def main():
               file=sys.stderr)
     print(f"  Total track doublings: {total_doublings}", file=sys.stderr)
 
-    # Save version
-    ver = save_version(
-        schedule,
-        label=args.version_label or "",
-        description=args.version_desc or "",
-    )
-    print(f"Saved as version {ver}", file=sys.stderr)
+    # Save every candidate as a version, the selected one last so the page
+    # opens on it and the others can be compared against it
+    others = [i for i in range(len(candidates)) if i != best]
+    for i in others + [best]:
+        label = args.version_label or ""
+        description = args.version_desc or ""
+        if len(candidates) > 1:
+            label = f"{label or 'Candidate'} #{i + 1}"
+            note = f"Candidate {i + 1} of {len(candidates)}" + (" (selected)" if i == best else "")
+            description = f"{description} — {note}" if description else note
+        ver = save_version(
+            candidates[i],
+            label=label,
+            description=description,
+        )
+        print(f"Saved as version {ver}", file=sys.stderr)
 
     # Write CSV + HTML
-    write_csv(schedule, sessions)
+    write_csv(schedule, session_map)
     write_html(sessions)
     print("\nDone!", file=sys.stderr)
 